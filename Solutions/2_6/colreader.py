@@ -1,7 +1,63 @@
 # colreader.py
 
+import array
 import collections
 import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+class DictColumn(collections.abc.Sequence):
+    '''
+    Column of strings stored as an array of integer codes
+    into a vocabulary of unique values
+    '''
+    def __init__(self):
+        self.codes = array.array('i')
+        self.vocab = []
+        self.index = { }
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.vocab[self.codes[index]]
+
+    def append(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.vocab)
+            self.vocab.append(value)
+        self.codes.append(code)
+
+    def take(self, indices):
+        '''
+        Make a new column from the given positions, sharing the vocabulary
+        '''
+        col = DictColumn()
+        col.codes = array.array('i', map(self.codes.__getitem__, indices))
+        col.vocab = self.vocab
+        col.index = self.index
+        return col
+
+def take(column, indices):
+    if isinstance(column, DictColumn):
+        return column.take(indices)
+    return array.array(column.typecode, map(column.__getitem__, indices))
+
+def make_column(func):
+    '''
+    Pick column storage based on the type conversion function
+    '''
+    if func is int:
+        return array.array('q')
+    elif func is float:
+        return array.array('d')
+    else:
+        return DictColumn()
 
 class DataCollection(collections.abc.Sequence):
     def __init__(self, columns):
@@ -15,22 +71,246 @@ class DataCollection(collections.abc.Sequence):
         return dict(zip(self.column_names,
                         (col[index] for col in self.column_data)))
 
+    def column(self, name):
+        return self.column_data[self.column_names.index(name)]
+
+    def unique(self, name):
+        '''
+        Return the set of distinct values in a column
+        '''
+        col = self.column(name)
+        if isinstance(col, DictColumn):
+            return { col.vocab[code] for code in set(col.codes) }
+        return set(col)
+
+    def group_sum(self, key_names, value_name):
+        '''
+        Sum a value column grouped by one or more key columns.  Returns
+        a Counter keyed by value (or by tuple of values for multiple keys).
+        '''
+        values = self.column(value_name)
+        if isinstance(key_names, str):
+            keycol = self.column(key_names)
+            if isinstance(keycol, DictColumn):
+                # Accumulate by code and only decode once per group.  The
+                # vocabulary may be shared with a column it was filtered
+                # from, so only codes that occur become groups.
+                totals = [0] * len(keycol.vocab)
+                seen = bytearray(len(keycol.vocab))
+                for code, value in zip(keycol.codes, values):
+                    totals[code] += value
+                    seen[code] = 1
+                return collections.Counter({ keycol.vocab[code]: total
+                                             for code, total in enumerate(totals) if seen[code] })
+            keys = keycol
+        else:
+            keys = zip(*(self.column(name) for name in key_names))
+
+        totals = collections.Counter()
+        for key, value in zip(keys, values):
+            totals[key] += value
+        return totals
+
+    def filter(self, name, predicate):
+        '''
+        Return a new DataCollection with the rows where predicate(value)
+        is true for the given column.  For dictionary encoded columns the
+        predicate is evaluated once per distinct value.
+        '''
+        col = self.column(name)
+        if isinstance(col, DictColumn):
+            keep = { code for code, value in enumerate(col.vocab) if predicate(value) }
+            indices = [ n for n, code in enumerate(col.codes) if code in keep ]
+        else:
+            indices = [ n for n, value in enumerate(col) if predicate(value) ]
+        return DataCollection(dict(zip(self.column_names,
+                                       (take(c, indices) for c in self.column_data))))
+
+
+def read_csv_as_columns(filename, types, *, cache=False):
+    '''
+    Read a CSV file into typed columns.  If cache is true, the parsed
+    columns are saved to a binary sidecar file (filename + '.colcache')
+    and loaded from there on later calls until the CSV file or the
+    conversion functions change.
+    '''
+    if cache:
+        cachename = filename + '.colcache'
+        fingerprint = _fingerprint(filename)
+        data = read_column_cache(cachename, types, fingerprint)
+        if data is None:
+            data = read_csv_as_columns(filename, types)
+            try:
+                write_column_cache(cachename, data, fingerprint, types)
+            except (OSError, TypeError):
+                pass       # The cache is only an optimization
+        return data
 
-def read_csv_as_columns(filename, types):
-    columns = collections.defaultdict(list)
     with open(filename) as f:
         rows = csv.reader(f)
         headers = next(rows)
+        columns = { name: make_column(func) for name, func in zip(headers, types) }
+        appends = [ col.append for col in columns.values() ]
         for row in rows:
-            for name, func, val in zip(headers, types, row):
-                columns[name].append(func(val))
-            
+            for append, func, val in zip(appends, types, row):
+                append(func(val))
+
     return DataCollection(columns)
 
+# Binary column cache.  The file layout is the magic string, the length
+# of a JSON header (8 bytes, little endian), the JSON header itself and
+# then the raw array buffer of every column, one after the other.  The
+# vocabularies of dictionary encoded columns hold the converted values,
+# so they are limited to what survives a trip through JSON.
+
+_json_scalars = (str, int, float, bool, type(None))
+
+CACHE_MAGIC = b'COLCACHE1\n'
+
+def _fingerprint(filename):
+    st = os.stat(filename)
+    return [ st.st_size, st.st_mtime_ns ]
+
+def _converter_id(func):
+    '''
+    Name a conversion function so a cache made with other conversions
+    is seen as stale.  Python functions also get a hash of their code,
+    which tells lambdas apart.
+    '''
+    ident = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', repr(func))}"
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        digest = hashlib.sha1(code.co_code + repr(code.co_consts).encode('utf-8'))
+        ident += ':' + digest.hexdigest()[:16]
+    return ident
+
+def write_column_cache(cachename, data, fingerprint, types):
+    '''
+    Save columns to a cache file.  Raises TypeError if a vocabulary
+    holds values that can't be stored.
+    '''
+    meta = { 'source': fingerprint, 'byteorder': sys.byteorder,
+             'converters': [ _converter_id(func) for func in types ], 'columns': [] }
+    buffers = []
+    offset = 0
+    for name, col in zip(data.column_names, data.column_data):
+        if isinstance(col, DictColumn):
+            buf, vocab = col.codes, col.vocab
+            if not all(type(value) in _json_scalars for value in vocab):
+                raise TypeError(f'Column {name!r} has values that cannot be cached')
+        else:
+            buf, vocab = col, None
+        meta['columns'].append({ 'name': name, 'typecode': buf.typecode,
+                                 'vocab': vocab, 'offset': offset, 'count': len(buf) })
+        buffers.append(buf)
+        offset += len(buf) * buf.itemsize
+
+    header = json.dumps(meta).encode('utf-8')
+    tmpname = cachename + '.tmp'
+    with open(tmpname, 'wb') as f:
+        f.write(CACHE_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for buf in buffers:
+            buf.tofile(f)
+    os.replace(tmpname, cachename)
+
+def read_column_cache(cachename, types, fingerprint):
+    '''
+    Load columns from a cache file through a memory map.  Returns None
+    if the cache is missing, stale, damaged or doesn't match the
+    requested types.
+    '''
+    try:
+        f = open(cachename, 'rb')
+    except FileNotFoundError:
+        return None
+
+    # A damaged cache is treated like a stale one
+    try:
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, memoryview(m) as view:
+            return _load_columns(view, types, fingerprint)
+    except (ValueError, struct.error, KeyError, TypeError):
+        return None
+
+def _load_columns(view, types, fingerprint):
+    if view[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+        return None
+    start = len(CACHE_MAGIC) + 8
+    (size,) = struct.unpack_from('<Q', view, len(CACHE_MAGIC))
+    meta = json.loads(bytes(view[start:start+size]))
+    if (meta['source'] != fingerprint or meta['byteorder'] != sys.byteorder
+        or meta['converters'] != [ _converter_id(func) for func in types ]
+        or len(meta['columns']) != len(types)):
+        return None
+
+    base = start + size
+    columns = { }
+    for info, func in zip(meta['columns'], types):
+        col = make_column(func)
+        if isinstance(col, DictColumn):
+            if info['vocab'] is None:
+                return None
+        elif info['vocab'] is not None or col.typecode != info['typecode']:
+            return None
+        buf = array.array(info['typecode'])
+        begin = base + info['offset']
+        buf.frombytes(view[begin:begin + info['count'] * buf.itemsize])
+        if len(buf) != info['count']:
+            return None
+        if isinstance(col, DictColumn):
+            # The values were converted before they were saved.  Only
+            # strings are interned again so that they are shared.
+            col.codes = buf
+            col.vocab = [ sys.intern(value) if type(value) is str else value
+                          for value in info['vocab'] ]
+            col.index = { value: code for code, value in enumerate(col.vocab) }
+        else:
+            col = buf
+        columns[info['name']] = col
+
+    return DataCollection(columns)
+
+def mmap_csv_as_columns(filename, types, *, columns=None):
+    '''
+    Read selected columns of a simple CSV file (no quoted commas or
+    newlines) through a memory map.  Each line is only split as far as
+    the last requested column and only the requested fields are decoded.
+    int and float columns are converted straight from bytes.
+    '''
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        headers = m.readline().decode().rstrip('\r\n').split(',')
+        if columns is None:
+            columns = headers
+        selected = [ (headers.index(name), types[headers.index(name)]) for name in columns ]
+        data = { name: make_column(func) for name, (_, func) in zip(columns, selected) }
+        fields = [ (index, func, col.append, func in (int, float))
+                   for (index, func), col in zip(selected, data.values()) ]
+        maxsplit = max(index for index, _ in selected) + 1
+        for line in iter(m.readline, b''):
+            row = line.rstrip(b'\r\n').split(b',', maxsplit)
+            if row == [b'']:
+                continue
+            for index, func, append, numeric in fields:
+                if numeric:
+                    append(func(row[index]))
+                else:
+                    append(func(row[index].strip(b'"').decode()))
+
+    return DataCollection(data)
+
 if __name__ == '__main__':
     import tracemalloc
     from sys import intern
 
     tracemalloc.start()
-    data = read_csv_as_columns('../../Data/ctabus.csv', [intern, intern, intern, int])
+    data = read_csv_as_columns('../../Data/ctabus.csv', [intern, intern, intern, int], cache=True)
     print(tracemalloc.get_traced_memory())
+
+    # The cta.py questions using column operations
+    print(len(data.unique('route')), 'routes')
+    rides_per_route = data.group_sum('route', 'rides')
+    rides_2001 = data.filter('date', lambda d: d.endswith('/2001')).group_sum('route', 'rides')
+    rides_2011 = data.filter('date', lambda d: d.endswith('/2011')).group_sum('route', 'rides')
+    for route, diff in (rides_2011 - rides_2001).most_common(5):
+        print(route, diff)
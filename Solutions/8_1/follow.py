@@ -1,19 +1,257 @@
 # follow.py
 import os
 import time
+from filewatch import watch
 
-def follow(filename):
+def load_checkpoint(path):
+    '''
+    Return the (inode, offset) saved in a checkpoint file or None
+    '''
+    try:
+        with open(path) as f:
+            inode, offset = f.read().split()
+            return int(inode), int(offset)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(path, inode, offset):
+    tmpname = path + '.tmp'
+    with open(tmpname, 'w') as f:
+        f.write(f'{inode} {offset}\n')
+    os.replace(tmpname, path)
+
+class Tail:
+    '''
+    Read complete lines from the end of a file, reopening it if it is
+    rotated and rereading it if it is truncated.  start is an (inode,
+    offset) position to resume from.  If it is None, reading starts at
+    the end of the file.
+
+    The last few bytes before the offset are kept.  If they no longer
+    match the file, it has been truncated and rewritten, even if it has
+    grown back past the offset.
+    '''
+    marksize = 64
+
+    def __init__(self, filename, start=None):
+        self.filename = filename
+        self.f = open(filename, 'rb')
+        st = os.fstat(self.f.fileno())
+        self.inode = st.st_ino
+        if start is None:
+            self.f.seek(0, os.SEEK_END)
+        elif start[0] == self.inode and start[1] <= st.st_size:
+            self.f.seek(start[1])
+        self.offset = self.f.tell()
+        self.f.seek(max(self.offset - self.marksize, 0))
+        self.mark = self.f.read(self.offset - self.f.tell())
+
+    def readline(self):
+        '''
+        Return the next complete line or None.  A partial line is left
+        in the file until the rest of it has been written.
+        '''
+        line = self.f.readline()
+        if line.endswith(b'\n'):
+            self.offset += len(line)
+            self.mark = line[-self.marksize:]
+            return line.decode()
+        self.f.seek(self.offset)
+        return None
+
+    def readlines(self, size=65536):
+        '''
+        Return a list of the complete lines in about the next size bytes.
+        A line longer than size is returned whole.
+        '''
+        data = self.f.read(size)
+        end = data.rfind(b'\n') + 1
+        if not end and len(data) == size:
+            data += self.f.readline()
+            end = data.rfind(b'\n') + 1
+        if not end:
+            self.f.seek(self.offset)
+            return []
+        if end < len(data):
+            self.f.seek(self.offset + end)
+        self.offset += end
+        self.mark = data[max(end - self.marksize, 0):end]
+        return data[:end].decode().splitlines(keepends=True)
+
+    def reopen(self):
+        '''
+        Check for rotation or truncation.  Returns True if there may be
+        more lines to read (the file was reopened or rewound, or complete
+        lines are left in a rotated file), False if it is unchanged and
+        None if it is missing (rotated, new file not there yet).
+        '''
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        if st.st_ino != self.inode:
+            # Finish the lines written to the old file before switching
+            if b'\n' in self.f.read():
+                self.f.seek(self.offset)
+                return True
+            self.f.close()
+            self.f = open(self.filename, 'rb')
+            self.inode = os.fstat(self.f.fileno()).st_ino
+        elif st.st_size >= self.offset and self._same():
+            return False
+        self.f.seek(0)
+        self.offset = 0
+        self.mark = b''
+        return True
+
+    def _same(self):
+        # Do the bytes before the offset still match?
+        self.f.seek(self.offset - len(self.mark))
+        same = self.f.read(len(self.mark)) == self.mark
+        self.f.seek(self.offset)
+        return same
+
+    def close(self):
+        self.f.close()
+
+def follow(filename, *, checkpoint=None, checkpoint_every=1000):
     '''
     Generator that produces a sequence of lines being written at the end of a file.
+
+    If the file is rotated (replaced by a new file) or truncated, it is
+    reopened or reread from the start.  Only complete lines are produced.
+
+    If checkpoint names a file, the position after the last line that was
+    processed is saved there every checkpoint_every lines, whenever the
+    follower goes idle and when the generator is closed.  A line counts as
+    processed once the consumer asks for the next one, so a line that was
+    being handled when the generator was closed is produced again.  A
+    later follow() of the same file resumes from the saved position
+    instead of the end of the file.  If the file was replaced in the
+    meantime, it is read from the start.
+    '''
+    saved = load_checkpoint(checkpoint) if checkpoint else None
+    tail = Tail(filename, saved)
+    watcher = watch(filename)
+    committed = (tail.inode, tail.offset)
+    try:
+        count = 0
+        while True:
+            line = tail.readline()
+            if line is not None:
+                watcher.reset()
+                position = (tail.inode, tail.offset)
+                yield line
+                committed = position
+                count += 1
+                if checkpoint and count >= checkpoint_every:
+                    save_checkpoint(checkpoint, *committed)
+                    count = 0
+                continue
+
+            if checkpoint and count:
+                save_checkpoint(checkpoint, *committed)
+                count = 0
+            status = tail.reopen()
+            if status is None:
+                watcher.wait(0.1)
+            elif status:
+                watcher.add(filename)
+            else:
+                watcher.wait()       # Block until the file changes
+    finally:
+        if checkpoint:
+            save_checkpoint(checkpoint, *committed)
+        tail.close()
+        watcher.close()
+
+def follow_many(filenames):
+    '''
+    Generator that follows several files at once and produces (filename, line)
+    tuples.  All of the files are watched by a single watcher.  Files are read
+    in the order that their changes arrive and each one is read up to its end
+    before moving on.  Rotation and truncation are handled as in follow().
     '''
-    with open(filename,'r') as f:
-        f.seek(0,os.SEEK_END)
+    filenames = list(dict.fromkeys(filenames))
+    tails = { }
+    watcher = watch(*filenames)
+    try:
+        for filename in filenames:
+            tails[filename] = Tail(filename)
+        missing = set()
         while True:
-             line = f.readline()
-             if line == '':
-                 time.sleep(0.1)    # Sleep briefly to avoid busy wait
-                 continue
-             yield line
+            # Missing files are rechecked every 0.1 seconds
+            changed = watcher.changed(0.1 if missing else None)
+            changed.extend(missing.difference(changed))
+            active = False
+            for filename in changed:
+                tail = tails[filename]
+                while True:
+                    line = tail.readline()
+                    if line is not None:
+                        active = True
+                        yield filename, line
+                        continue
+                    status = tail.reopen()
+                    if status is None:
+                        missing.add(filename)
+                        break
+                    missing.discard(filename)
+                    if not status:
+                        break
+                    watcher.add(filename)
+            if active:
+                watcher.reset()
+    finally:
+        for tail in tails.values():
+            tail.close()
+        watcher.close()
+
+def follow_batches(filename, max_batch=1000, max_delay=0.0, bufsize=65536):
+    '''
+    Generator that produces lists of complete lines being written at the end
+    of a file.  Available data is read about bufsize bytes at a time.  A
+    partial line at the end is held until the rest of it arrives.  Lists
+    have at most max_batch lines.  If max_delay is set, a short batch is held
+    back for up to max_delay seconds waiting for more lines.  Rotation and
+    truncation are handled as in follow().
+    '''
+    pending = []
+    first = 0.0
+    tail = Tail(filename)
+    watcher = watch(filename)
+    try:
+        while True:
+            lines = tail.readlines(bufsize)
+            if lines:
+                watcher.reset()
+                if not pending:
+                    first = time.monotonic()
+                pending.extend(lines)
+                while len(pending) >= max_batch:
+                    yield pending[:max_batch]
+                    del pending[:max_batch]
+                continue               # More data is probably waiting
+
+            if pending:
+                remaining = first + max_delay - time.monotonic()
+                if remaining <= 0:
+                    yield pending
+                    pending = []
+                else:
+                    watcher.wait(remaining)
+                continue
+
+            status = tail.reopen()
+            if status is None:
+                watcher.wait(0.1)
+            elif status:
+                watcher.add(filename)
+            else:
+                watcher.wait()       # Block until the file changes
+    finally:
+        tail.close()
+        watcher.close()
 
 # Example use
 if __name__ == '__main__':
@@ -1,6 +1,9 @@
 # teststock.py
 
+import follow
+import os
 import stock
+import tempfile
 import unittest
 
 class TestStock(unittest.TestCase):
@@ -66,5 +69,93 @@ class TestStock(unittest.TestCase):
         with self.assertRaises(AttributeError):
             s.share = 100
 
+class TestFollow(unittest.TestCase):
+    # Every next() below has data waiting, so the follower never blocks.
+    # A checkpoint at offset 0 makes follow() start at the beginning.
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'log.csv')
+        self.checkpoint = os.path.join(self.tmpdir.name, 'log.ckpt')
+        self.write('', 'w')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, text, mode='a'):
+        with open(self.filename, mode) as f:
+            f.write(text)
+
+    def follow_from_start(self):
+        follow.save_checkpoint(self.checkpoint, os.stat(self.filename).st_ino, 0)
+        return follow.follow(self.filename, checkpoint=self.checkpoint)
+
+    def test_append(self):
+        self.write('a1\na2\n')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 'a1\n')
+        self.write('a3\n')
+        self.assertEqual(next(lines), 'a2\n')
+        self.assertEqual(next(lines), 'a3\n')
+        lines.close()
+
+    def test_partial_line(self):
+        self.write('a1\npar')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 'a1\n')
+        self.write('tial\n')
+        self.assertEqual(next(lines), 'partial\n')
+        lines.close()
+
+    def test_rotation(self):
+        self.write('a1\n')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 'a1\n')
+        self.write('a2\n')
+        os.rename(self.filename, self.filename + '.1')
+        self.write('b1\n', 'w')
+        self.assertEqual(next(lines), 'a2\n')
+        self.assertEqual(next(lines), 'b1\n')
+        lines.close()
+
+    def test_truncation(self):
+        self.write('a1\na2\n')
+        lines = self.follow_from_start()
+        self.assertEqual([next(lines), next(lines)], ['a1\n', 'a2\n'])
+        self.write('b1\n', 'w')
+        self.assertEqual(next(lines), 'b1\n')
+        lines.close()
+
+    def test_rewrite(self):
+        # Truncated and rewritten back to the same size
+        self.write('a1\n')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 'a1\n')
+        self.write('b1\n', 'w')
+        self.assertEqual(next(lines), 'b1\n')
+        lines.close()
+
+    def test_resume(self):
+        self.write('t1\nt2\nt3\n')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 't1\n')
+        self.assertEqual(next(lines), 't2\n')
+        lines.close()            # t2 was not processed
+        lines = follow.follow(self.filename, checkpoint=self.checkpoint)
+        self.assertEqual(next(lines), 't2\n')
+        self.assertEqual(next(lines), 't3\n')
+        lines.close()
+
+    def test_resume_replaced(self):
+        self.write('t1\nt2\n')
+        lines = self.follow_from_start()
+        self.assertEqual(next(lines), 't1\n')
+        next(lines)
+        lines.close()
+        os.rename(self.filename, self.filename + '.1')
+        self.write('n1\n', 'w')
+        lines = follow.follow(self.filename, checkpoint=self.checkpoint)
+        self.assertEqual(next(lines), 'n1\n')
+        lines.close()
+
 if __name__ == '__main__':
     unittest.main()
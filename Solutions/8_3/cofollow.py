@@ -1,16 +1,17 @@
 # cofollow.py
 import os
-import time
+from filewatch import watch
 
 def follow(filename, target):
-    with open(filename, 'r') as f:
+    with open(filename, 'r') as f, watch(filename) as watcher:
         f.seek(0,os.SEEK_END)
         while True:
             line = f.readline()
             if line != '':
+                watcher.reset()
                 target.send(line)
             else:
-                time.sleep(0.1)
+                watcher.wait()
 
 # Decorator for coroutines
 from functools import wraps
@@ -0,0 +1,163 @@
+# filewatch.py
+#
+# Wait for files to change.  On Linux this blocks on inotify (through
+# ctypes) so that new data is seen right away and an idle follower uses
+# no CPU.  Elsewhere it falls back to polling with exponential backoff.
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVE_SELF = 0x00000800
+IN_DELETE_SELF = 0x00000400
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+IN_IGNORED = 0x00008000
+
+# struct inotify_event header: wd, mask, cookie, len (followed by a name)
+_event = struct.Struct('iIII')
+
+class InotifyWatcher:
+    '''
+    Block until inotify events arrive for any of the watched files
+    '''
+    mask = IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF
+
+    def __init__(self, *filenames):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = { }
+        try:
+            for filename in filenames:
+                self.add(filename)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def add(self, filename):
+        '''
+        Watch filename.  If it has been replaced by a new file, the
+        watch on the old file is dropped.
+        '''
+        wd = self._add_watch(self.fd, os.fsencode(filename), self.mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed', filename)
+        for old, name in list(self.watches.items()):
+            if name == filename and old != wd:
+                self._rm_watch(self.fd, old)
+                del self.watches[old]
+        self.watches[wd] = filename
+
+    def fileno(self):
+        return self.fd
+
+    def wait(self, timeout=None):
+        '''
+        Wait for a file to change.  Returns False on timeout.
+        '''
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self.events()
+        return True
+
+    def changed(self, timeout=None):
+        '''
+        Wait for files to change and return their names in the order
+        that the events arrived.  Returns an empty list on timeout.
+        '''
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        return list(dict.fromkeys(self.events()))
+
+    def events(self):
+        '''
+        Read all pending events and return the filenames they are for
+        '''
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, size = _event.unpack_from(data, pos)
+                pos += _event.size + size
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                elif wd in self.watches:
+                    names.append(self.watches[wd])
+
+    def reset(self):
+        pass
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class PollWatcher:
+    '''
+    Sleep between checks, doubling the delay from min_delay up to
+    max_delay while the files stay idle
+    '''
+    def __init__(self, *filenames, min_delay=0.001, max_delay=0.1):
+        self.filenames = list(filenames)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min_delay
+
+    def add(self, filename):
+        if filename not in self.filenames:
+            self.filenames.append(filename)
+
+    def changed(self, timeout=None):
+        # Any of the files might have changed
+        self.wait(timeout)
+        return list(self.filenames)
+
+    def wait(self, timeout=None):
+        delay = self.delay if timeout is None else min(self.delay, timeout)
+        time.sleep(delay)
+        self.delay = min(self.delay * 2, self.max_delay)
+        return True
+
+    def reset(self):
+        self.delay = self.min_delay
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def watch(*filenames):
+    '''
+    Return the best available watcher for filenames
+    '''
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(*filenames)
+        except (AttributeError, OSError, TypeError):
+            pass
+    return PollWatcher(*filenames)
@@ -0,0 +1,48 @@
+# bench_parse.py
+#
+# Compare the generator chain in parse_stock_data() with the fused
+# record and column parsers.  The lines of Data/dowstocks.csv are
+# repeated to make a batch of the requested size.
+#
+#    python bench_parse.py --lines 1000000
+
+import argparse
+import gc
+import os
+import sys
+import time
+from itertools import islice, cycle
+
+from follow import parse_stock_data, parse_stock_records, parse_stock_columns
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+parsers = {
+    'generator chain': lambda lines: list(parse_stock_data(lines)),
+    'fused records': parse_stock_records,
+    'fused columns': parse_stock_columns,
+}
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Benchmark stock log parsers')
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(here, '../../Data/dowstocks.csv')) as f:
+        lines = list(islice(cycle(f.readlines()), args.lines))
+
+    base = None
+    for name, parse in parsers.items():
+        best = float('inf')
+        for _ in range(args.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            result = parse(lines)
+            best = min(best, time.perf_counter() - start)
+            del result
+        base = base or best
+        print('%-16s %8.3f s  %5.2fx' % (name, best, base / best))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,6 +1,8 @@
 # follow.py
 import os
 import time
+from array import array
+from itertools import repeat
 
 def follow(filename):
     '''
@@ -48,6 +50,62 @@ def parse_stock_data(lines):
     records = convert(records,int,['volume'])
     return records
 
+# Fused parsers.  Instead of passing each line through a chain of
+# generators, a whole batch of lines with a fixed list of columns is
+# split, unquoted and converted at once.  The record parser is a single
+# generated comprehension.  The column parser splits the joined batch
+# and slices out each column.  Columns of type str are unquoted.  Other
+# types are called on the text.
+
+stock_names = ['name','price','date','time','change','open','high','low','volume']
+stock_types = [str, float, str, str, float, float, float, float, int]
+
+def make_record_parser(names, types):
+    '''
+    Make a function that turns a list of lines into a list of dicts
+    '''
+    # The fields are bound to generated names _f0, _f1, ... so the
+    # column names only appear in the code as string literals
+    values = [ f"_f{n}.strip('\"')" if func is str else f'_conv{n}(_f{n})'
+               for n, func in enumerate(types) ]
+    items = ', '.join(f'{name!r}: {value}' for name, value in zip(names, values))
+    variables = ', '.join(f'_f{n}' for n in range(len(names)))
+    code = f'def parse_records(lines):\n' \
+           f'    return [ {{{items}}}\n' \
+           f'             for {variables}, in map(_split, lines, _sep) ]\n'
+    env = { f'_conv{n}': func for n, func in enumerate(types) }
+    env.update(_split=str.split, _sep=repeat(','))
+    exec(code, env)
+    return env['parse_records']
+
+_typecodes = { float: 'd', int: 'q' }
+
+def make_column_parser(names, types):
+    '''
+    Make a function that turns a list of lines into a dict of columns.
+    Numeric columns are arrays, str columns are lists.
+    '''
+    ncols = len(names)
+    def parse_columns(lines):
+        # One split of the joined batch, then every ncols-th field
+        fields = ','.join(lines).split(',') if lines else []
+        if len(fields) != ncols * len(lines):
+            raise ValueError(f'Expected {ncols * len(lines)} fields, got {len(fields)}')
+        result = { }
+        for n, (name, func) in enumerate(zip(names, types)):
+            column = fields[n::ncols]
+            if func is str:
+                result[name] = [ value.strip('"') for value in column ]
+            elif func in _typecodes:
+                result[name] = array(_typecodes[func], map(func, column))
+            else:
+                result[name] = list(map(func, column))
+        return result
+    return parse_columns
+
+parse_stock_records = make_record_parser(stock_names, stock_types)
+parse_stock_columns = make_column_parser(stock_names, stock_types)
+
 # Sample use
 if __name__ == '__main__':
    lines = follow("../../Data/stocklog.dat")
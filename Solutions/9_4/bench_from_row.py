@@ -0,0 +1,42 @@
+# bench_from_row.py
+#
+# Compare the generic Structure.from_row() against the per-class
+# version generated by validate_attributes().
+
+import csv
+import time
+from structly import *
+
+class Ticker(Structure):
+    name = String()
+    price = Float()
+    date = String()
+    time = String()
+    change = Float()
+    open = Float()
+    high = Float()
+    low = Float()
+    volume = Integer()
+
+generic_from_row = Structure.from_row.__func__
+
+def rows_per_sec(func, rows, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            func(Ticker, row)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+if __name__ == '__main__':
+    with open('../../Data/dowstocks.csv') as f:
+        rows = list(csv.reader(f)) * 20
+
+    assert generic_from_row(Ticker, rows[0]) == Ticker.from_row(rows[0])
+    before = rows_per_sec(generic_from_row, rows)
+    after = rows_per_sec(Ticker.from_row.__func__, rows)
+    print('%d rows' % len(rows))
+    print('generic   %10.0f rows/sec' % before)
+    print('compiled  %10.0f rows/sec' % after)
+    print('speedup   %10.2fx' % (after / before))
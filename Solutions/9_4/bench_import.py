@@ -0,0 +1,46 @@
+# bench_import.py
+#
+# Measure the import time of structly with python -X importtime.  Each
+# statement is run in a fresh interpreter several times and the best
+# cumulative time (in microseconds) of the structly package is reported,
+# along with the slowest modules it pulled in.
+
+import subprocess
+import sys
+
+statements = [
+    'import structly',
+    'from structly import Structure',
+    'from structly import *',
+]
+
+def importtime(statement):
+    '''
+    Run statement in a new interpreter and return a list of
+    (cumulative_us, module) for the top-level imports it made
+    '''
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        if module.startswith('  '):
+            continue            # Nested import, already counted by its parent
+        times.append((int(cumulative), module.strip()))
+
+    # Drop the interpreter's own startup imports
+    for n, (_, module) in enumerate(times):
+        if module.startswith('structly'):
+            return times[n:]
+    return []
+
+if __name__ == '__main__':
+    repeat = 5
+    for statement in statements:
+        best = min((importtime(statement) for _ in range(repeat)),
+                   key=lambda times: sum(t for t, _ in times))
+        print('%-34s %8d us' % (statement, sum(t for t, _ in best)))
+        for t, module in sorted(best, reverse=True)[:5]:
+            print('    %-30s %8d us' % (module, t))
@@ -0,0 +1,111 @@
+# bench_records.py
+#
+# Compare the memory use and read time of the different record
+# representations from the exercises (tuples, namedtuples, dicts, classes,
+# slots, columns) along with structly instances.  A synthetic ctabus-style
+# dataset is generated locally.  Results are printed as one JSON object
+# per line so that they can be saved and compared across changes.
+#
+#    python bench_records.py --rows 1000000 > results.jsonl
+
+import argparse
+import csv
+import gc
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from structly import Structure, read_csv_as_instances
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+here = os.path.dirname(os.path.abspath(__file__))
+readrides_2_1 = load_module('readrides_2_1', os.path.join(here, '../2_1/readrides.py'))
+readrides_2_5 = load_module('readrides_2_5', os.path.join(here, '../2_5/readrides.py'))
+colreader = load_module('colreader', os.path.join(here, '../2_6/colreader.py'))
+readrides_my = load_module('readrides_my', os.path.join(here, '../../my_Solutions/readrides.py'))
+
+class Ride(Structure):
+    route = String()
+    date = String()
+    daytype = String()
+    rides = Integer()
+
+class SlottedRide(Structure, slots=True):
+    route = String()
+    date = String()
+    daytype = String()
+    rides = Integer()
+
+readers = {
+    'tuples': readrides_2_1.read_rides_as_tuples,
+    'namedtuples': readrides_my.read_rides_as_named_tuples,
+    'dicts': readrides_2_1.read_rides_as_dicts,
+    'instances': readrides_2_1.read_rides_as_instances,
+    'slots': readrides_2_5.read_rides_as_instances,
+    'columns': readrides_2_5.read_rides_as_columns,
+    'ridedata': readrides_2_5.read_rides_as_dicts,
+    'typed_columns': lambda filename: colreader.read_csv_as_columns(filename, [sys.intern, sys.intern, sys.intern, int]),
+    'structly': lambda filename: read_csv_as_instances(filename, Ride),
+    'structly_slots': lambda filename: read_csv_as_instances(filename, SlottedRide),
+}
+
+def make_dataset(filename, nrows, seed=0):
+    '''
+    Write nrows of random bus ride data in the ctabus.csv format
+    '''
+    rand = random.Random(seed)
+    routes = [ str(n) for n in range(1, 190) ]
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['route', 'date', 'daytype', 'rides'])
+        for _ in range(nrows):
+            writer.writerow([rand.choice(routes),
+                             '%02d/%02d/%d' % (rand.randint(1, 12), rand.randint(1, 28), rand.randint(2001, 2011)),
+                             rand.choice('WAU'),
+                             rand.randint(0, 25000)])
+
+def run(name, reader, filename, nrows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        records = reader(filename)
+        best = min(best, time.perf_counter() - start)
+        del records
+
+    gc.collect()
+    tracemalloc.start()
+    records = reader(filename)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return { 'name': name, 'rows': nrows, 'seconds': round(best, 6),
+             'current_bytes': current, 'peak_bytes': peak,
+             'bytes_per_row': round(current / nrows, 1) }
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Benchmark record representations')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='*', choices=list(readers), default=list(readers))
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'ctabus.csv')
+        make_dataset(filename, args.rows, args.seed)
+        for name in args.only:
+            print(json.dumps(run(name, readers[name], filename, args.rows, args.repeat)), flush=True)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,39 @@
+# bench_validated.py
+#
+# Overhead of @validated on Stock.sell().  Positional calls take the
+# generated fast path.  Keyword calls take the slow path that binds the
+# signature on every call, as every call did before.
+
+import timeit
+from structly import *
+
+class PlainStock(Structure):
+    name = String()
+    shares = PositiveInteger()
+    price = PositiveFloat()
+
+    def sell(self, nshares):
+        self.shares -= nshares
+
+class Stock(Structure):
+    name = String()
+    shares = PositiveInteger()
+    price = PositiveFloat()
+
+    def sell(self, nshares: PositiveInteger):
+        self.shares -= nshares
+
+if __name__ == '__main__':
+    number = 200000
+    plain = PlainStock('GOOG', 10**9, 490.1)
+    s = Stock('GOOG', 10**9, 490.1)
+    tests = [
+        ('plain call', lambda: plain.sell(1)),
+        ('validated (positional)', lambda: s.sell(1)),
+        ('validated (keyword)', lambda: s.sell(nshares=1)),
+    ]
+    base = None
+    for name, func in tests:
+        t = min(timeit.repeat(func, number=number, repeat=5)) / number
+        base = base or t
+        print('%-24s %8.3f us  %5.2fx' % (name, t * 1e6, t / base))
@@ -1,9 +1,33 @@
 # structly/__init__.py
+#
+# Names and submodules are imported on first use (PEP 562 module
+# __getattr__), so that "import structly" stays cheap for short-lived
+# programs.  from structly import * still imports everything.
 
-from .structure import *
-from .reader import *
-from .tableformat import *
+from importlib import import_module
 
-__all__ = [ *structure.__all__,
-            *reader.__all__,
-            *tableformat.__all__ ]
+_exports = {
+    'structure': [ 'Structure' ],
+    'reader': [ 'read_csv_as_dicts', 'read_csv_as_instances',
+                'iter_read_csv_as_dicts', 'iter_read_csv_as_instances' ],
+    'tableformat': [ 'print_table', 'create_formatter' ],
+}
+
+_modules = { name: module for module, names in _exports.items() for name in names }
+
+_submodules = [ 'reader', 'structure', 'tableformat', 'validate' ]
+
+__all__ = list(_modules)
+
+def __getattr__(name):
+    if name in _submodules:
+        # Importing a submodule also binds it in this namespace
+        return import_module(f'.{name}', __name__)
+    if name not in _modules:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{_modules[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_submodules))
@@ -1,43 +1,197 @@
 # reader.py
 
+__all__ = [ 'read_csv_as_dicts', 'read_csv_as_instances',
+            'iter_read_csv_as_dicts', 'iter_read_csv_as_instances' ]
+
 import csv
+import io
 import logging
+import os
+from functools import partial
 
 log = logging.getLogger(__name__)
 
-def convert_csv(lines, converter, *, headers=None):
+def select_rows(rows, headers, *, columns=None, where=None, bad=None):
+    '''
+    Number the rows and apply the where tests and column projection.
+    where maps column names to predicates on the raw string values.
+    Rows failing a test are dropped before any type conversion and
+    only the requested columns are kept.  Rows too short to hold the
+    tested or selected columns are passed to bad(rowno, row, reason)
+    and dropped.
+    '''
+    rows = enumerate(rows, start=1)
+    tests = [ (headers.index(name), test) for name, test in where.items() ] if where else []
+    indices = [ headers.index(name) for name in columns ] if columns else []
+    width = max([ index for index, _ in tests ] + indices, default=-1) + 1
+    if width:
+        rows = _full_rows(rows, width, bad)
+    if tests:
+        rows = ((rowno, row) for rowno, row in rows
+                if all(test(row[index]) for index, test in tests))
+    if indices:
+        rows = ((rowno, [ row[index] for index in indices ]) for rowno, row in rows)
+    return rows
+
+def _full_rows(rows, width, bad):
+    for rowno, row in rows:
+        if len(row) >= width:
+            yield rowno, row
+        elif bad:
+            bad(rowno, row, ValueError(f'Expected at least {width} fields, got {len(row)}'))
+
+def _log_bad_row(rowno, row, reason):
+    log.warning('Row %s: Bad row: %s', rowno, row)
+    log.debug('Row %s: Reason: %s', rowno, reason)
+
+def iter_convert_csv(lines, converter, *, headers=None, columns=None, where=None):
+    '''
+    Generator that converts CSV lines one record at a time.  Bad rows
+    are logged and skipped.
+    '''
     rows = csv.reader(lines)
     if headers is None:
         headers = next(rows)
 
+    for rowno, row in select_rows(rows, headers, columns=columns, where=where, bad=_log_bad_row):
+        try:
+            record = converter(columns or headers, row)
+        except ValueError as e:
+            _log_bad_row(rowno, row, e)
+            continue
+        yield record
+
+def convert_csv(lines, converter, *, headers=None, columns=None, where=None):
+    return list(iter_convert_csv(lines, converter, headers=headers, columns=columns, where=where))
+
+# Converters are module-level functions (bound with partial) so that
+# they can be pickled and sent to worker processes
+def _dict_converter(types, headers, row):
+    return { name: func(val) for name, func, val in zip(headers, types, row) }
+
+def _instance_converter(cls, headers, row):
+    return cls.from_row(row)
+
+def iter_csv_as_dicts(lines, types, *, headers=None, columns=None, where=None):
+    return iter_convert_csv(lines, partial(_dict_converter, types),
+                            headers=headers, columns=columns, where=where)
+
+def iter_csv_as_instances(lines, cls, *, headers=None, columns=None, where=None):
+    return iter_convert_csv(lines, partial(_instance_converter, cls),
+                            headers=headers, columns=columns, where=where)
+
+def csv_as_dicts(lines, types, *, headers=None, columns=None, where=None):
+    return list(iter_csv_as_dicts(lines, types, headers=headers, columns=columns, where=where))
+
+def csv_as_instances(lines, cls, *, headers=None, columns=None, where=None):
+    return list(iter_csv_as_instances(lines, cls, headers=headers, columns=columns, where=where))
+
+def _chunk_ranges(filename, nchunks, skip_header):
+    '''
+    Split a file into (start, end) byte ranges that fall on line boundaries.
+    Quoted fields containing newlines are not supported.
+    '''
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        start = len(f.readline()) if skip_header else 0
+        ranges = []
+        for n in range(1, nchunks + 1):
+            if n == nchunks:
+                end = size
+            else:
+                f.seek(max(start, size * n // nchunks))
+                f.readline()
+                end = f.tell()
+            if end > start:
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+def _convert_chunk(filename, converter, headers, columns, where, byterange):
+    '''
+    Convert one chunk of a file in a worker process.  Bad rows are
+    returned with their chunk-relative row numbers for logging by the parent.
+    '''
+    start, end = byterange
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        lines = io.TextIOWrapper(io.BytesIO(f.read(end - start)))
     records = []
-    for rowno, row in enumerate(rows, start=1):
+    bad = []
+    rows = csv.reader(lines)
+    def bad_row(rowno, row, reason):
+        bad.append((rowno, row, str(reason)))
+    for rowno, row in select_rows(rows, headers, columns=columns, where=where, bad=bad_row):
         try:
-            records.append(converter(headers, row))
+            records.append(converter(columns or headers, row))
         except ValueError as e:
-            log.warning('Row %s: Bad row: %s', rowno, row)
-            log.debug('Row %s: Reason: %s', rowno, row)
-    return records
+            bad_row(rowno, row, e)
+    return records, bad, rows.line_num
+
+def parallel_convert_csv(filename, converter, *, headers=None, columns=None, where=None,
+                         parallel=os.cpu_count()):
+    '''
+    Convert a CSV file in chunks across a pool of processes.  Results
+    are returned in file order.  The converter and any where tests are
+    sent to the workers, so they must be picklable.
+    '''
+    from concurrent.futures import ProcessPoolExecutor
 
-def csv_as_dicts(lines, types, *, headers=None):
-    return convert_csv(lines, 
-                       lambda headers, row: { name: func(val) for name, func, val in zip(headers, types, row) })
+    skip_header = headers is None
+    if skip_header:
+        with open(filename) as file:
+            headers = next(csv.reader(file))
 
-def csv_as_instances(lines, cls, *, headers=None):
-    return convert_csv(lines,
-                       lambda headers, row: cls.from_row(row))
+    ranges = _chunk_ranges(filename, parallel, skip_header)
+    records = []
+    offset = 0
+    with ProcessPoolExecutor(parallel) as pool:
+        for chunk, bad, nrows in pool.map(partial(_convert_chunk, filename, converter,
+                                                        headers, columns, where), ranges):
+            records.extend(chunk)
+            for rowno, row, reason in bad:
+                _log_bad_row(offset + rowno, row, reason)
+            offset += nrows
+    return records
 
-def read_csv_as_dicts(filename, types, *, headers=None):
+def read_csv_as_dicts(filename, types, *, headers=None, columns=None, where=None, parallel=None):
     '''
-    Read CSV data into a list of dictionaries with optional type conversion
+    Read CSV data into a list of dictionaries with optional type conversion.
+    If columns is given, only those columns are kept and types applies to
+    them.  where maps column names to tests on the raw strings.  If parallel
+    is given, the file is parsed by that many processes.
     '''
+    if parallel:
+        return parallel_convert_csv(filename, partial(_dict_converter, types),
+                                    headers=headers, columns=columns, where=where,
+                                    parallel=parallel)
     with open(filename) as file:
-        return csv_as_dicts(file, types, headers=headers)
+        return csv_as_dicts(file, types, headers=headers, columns=columns, where=where)
 
-def read_csv_as_instances(filename, cls, *, headers=None):
+def read_csv_as_instances(filename, cls, *, headers=None, columns=None, where=None, parallel=None):
     '''
-    Read CSV data into a list of instances
+    Read CSV data into a list of instances.  If columns is given, those
+    columns are passed to cls.from_row() in that order.  where maps column
+    names to tests on the raw strings.  If parallel is given, the file is
+    parsed by that many processes.
     '''
+    if parallel:
+        return parallel_convert_csv(filename, partial(_instance_converter, cls),
+                                    headers=headers, columns=columns, where=where,
+                                    parallel=parallel)
     with open(filename) as file:
-        return csv_as_instances(file, cls, headers=headers)
+        return csv_as_instances(file, cls, headers=headers, columns=columns, where=where)
 
+def iter_read_csv_as_dicts(filename, types, *, headers=None, columns=None, where=None):
+    '''
+    Lazily read CSV data, producing one dictionary at a time
+    '''
+    with open(filename) as file:
+        yield from iter_csv_as_dicts(file, types, headers=headers, columns=columns, where=where)
+
+def iter_read_csv_as_instances(filename, cls, *, headers=None, columns=None, where=None):
+    '''
+    Lazily read CSV data, producing one instance at a time
+    '''
+    with open(filename) as file:
+        yield from iter_csv_as_instances(file, cls, headers=headers, columns=columns, where=where)
@@ -7,17 +7,36 @@ from collections import ChainMap
 
 class StructureMeta(type):
     @classmethod
-    def __prepare__(meta, clsname, bases):
+    def __prepare__(meta, clsname, bases, **kwargs):
         return ChainMap({}, Validator.validators)
         
     @staticmethod
-    def __new__(meta, name, bases, methods):
+    def __new__(meta, name, bases, methods, *, slots=False):
         methods = methods.maps[0]
+        if slots:
+            # A slot can't share its name with a class attribute, so the
+            # validators are moved aside and applied by __setattr__ instead
+            validators = { key: val for key, val in methods.items()
+                           if isinstance(val, Validator) }
+            for key, val in validators.items():
+                del methods[key]
+                val.__set_name__(None, key)
+            methods['__slots__'] = tuple(validators)
+            methods['_slot_validators'] = validators
+            methods['__setattr__'] = _slots_setattr
         return super().__new__(meta, name, bases, methods)
 
+def _slots_setattr(self, name, value):
+    validator = self._slot_validators.get(name)
+    if validator is None:
+        raise AttributeError('No attribute %s' % name)
+    object.__setattr__(self, name, validator.check(value))
+
 class Structure(metaclass=StructureMeta):
+    __slots__ = ()
     _fields = ()
     _types = ()
+    _slot_validators = { }
 
     def __setattr__(self, name, value):
         if name.startswith('_') or name in self._fields:
@@ -41,6 +60,18 @@ class Structure(metaclass=StructureMeta):
         rowdata = [ func(val) for func, val in zip(cls._types, row) ]
         return cls(*rowdata)
 
+    _from_row_unchecked = from_row
+
+    @classmethod
+    def from_rows(cls, rows, *, validate=True):
+        '''
+        Create a list of instances from rows.  validate=False skips the
+        validator checks (the type conversions are still applied) and is
+        only meant for data that is already known to be good.
+        '''
+        from_row = cls.from_row if validate else cls._from_row_unchecked
+        return [ from_row(row) for row in rows ]
+
     @classmethod
     def create_init(cls):
         '''
@@ -54,6 +85,47 @@ class Structure(metaclass=StructureMeta):
         exec(code, locs)
         cls.__init__ = locs['__init__']
 
+    @classmethod
+    def create_from_row(cls):
+        '''
+        Create a specialized from_row() class method from _fields and _types.
+        Conversions and checks are inlined and the instance dictionary is
+        filled in directly rather than going through each descriptor.
+        A second version without the checks is used by from_rows().
+        A from_row() defined by the class itself is left alone and also
+        used by from_rows() unless the class defines _from_row_unchecked.
+        '''
+        if 'from_row' not in vars(cls):
+            cls.from_row = classmethod(cls._make_from_row(checked=True))
+            if '_from_row_unchecked' not in vars(cls):
+                cls._from_row_unchecked = classmethod(cls._make_from_row(checked=False))
+        elif '_from_row_unchecked' not in vars(cls):
+            cls._from_row_unchecked = vars(cls)['from_row']
+
+    @classmethod
+    def _make_from_row(cls, checked):
+        env = { '_new': object.__new__ }
+        code = 'def from_row(cls, row):\n'
+        code += '    self = _new(cls)\n'
+        if '__slots__' in vars(cls):
+            for n, name in enumerate(cls._fields):
+                env[f'_type{n}'] = cls._types[n]
+                env[f'_check{n}'] = cls._slot_validators[name].check
+                env[f'_set{n}'] = getattr(cls, name).__set__
+                value = f'_check{n}(_type{n}(row[{n}]))' if checked else f'_type{n}(row[{n}])'
+                code += f'    _set{n}(self, {value})\n'
+        else:
+            items = []
+            for n, name in enumerate(cls._fields):
+                env[f'_type{n}'] = cls._types[n]
+                env[f'_check{n}'] = getattr(cls, name).check
+                value = f'_check{n}(_type{n}(row[{n}]))' if checked else f'_type{n}(row[{n}])'
+                items.append(f'{name!r}: {value}')
+            code += f'    self.__dict__.update({{ {", ".join(items)} }})\n'
+        code += '    return self\n'
+        exec(code, env)
+        return env['from_row']
+
     @classmethod
     def __init_subclass__(cls):
         # Apply the validated decorator to subclasses
@@ -69,6 +141,9 @@ def validate_attributes(cls):
         if isinstance(val, Validator):
             validators.append(val)
 
+        elif name == '_slot_validators':
+            validators.extend(val.values())
+
         # Apply validated decorator to any callable with annotations
         elif callable(val) and val.__annotations__:
             setattr(cls, name, validated(val))
@@ -81,9 +156,10 @@ def validate_attributes(cls):
     cls._types = tuple([ getattr(v, 'expected_type', lambda x: x)
                    for v in validators ])
 
-    # Create the __init__ method
+    # Create the __init__ and from_row methods
     if cls._fields:
         cls.create_init()
+        cls.create_from_row()
 
     
     return cls
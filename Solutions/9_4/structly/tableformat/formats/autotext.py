@@ -0,0 +1,56 @@
+# autotext.py
+
+from .text import TextTableFormatter
+
+class AutoTextTableFormatter(TextTableFormatter):
+    '''
+    Text table with column widths fitted to the data.  Rows are held
+    back until sample_size of them have arrived (or until flush()).  The
+    widths are computed from the headers and those rows.  After that
+    every row is printed with a single precompiled format string.  Later
+    values wider than their column are printed in full.
+    '''
+    sample_size = 1000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._headers = None
+        self._line = None
+        self._sample = []
+
+    def headings(self, headers):
+        self._headers = list(headers)
+        self._line = None
+        self._sample = []
+
+    def row(self, rowdata):
+        self.rows([rowdata])
+
+    def rows(self, batch):
+        if self._line is None:
+            self._sample.extend(batch)
+            if len(self._sample) < self.sample_size:
+                return
+            batch, self._sample = self._sample, []
+            self._layout(batch[:self.sample_size])
+        self._emit(batch)
+
+    def flush(self):
+        if self._line is None and self._headers is not None:
+            sample, self._sample = self._sample, []
+            self._layout(sample)
+            self._emit(sample)
+        super().flush()
+
+    def _emit(self, batch):
+        if batch:
+            line = self._line
+            self.write(''.join([ line % tuple(rowdata) for rowdata in batch ]), len(batch))
+
+    def _layout(self, sample):
+        widths = [ len(h) for h in self._headers ]
+        for rowdata in sample:
+            widths = [ max(w, len(str(d))) for w, d in zip(widths, rowdata) ]
+        self._line = ' '.join('%{}s'.format(w) for w in widths) + '\n'
+        self.write(self._line % tuple(self._headers))
+        self.write(' '.join('-' * w for w in widths) + '\n')
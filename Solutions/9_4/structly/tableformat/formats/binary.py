@@ -0,0 +1,103 @@
+# binary.py
+
+import struct
+import sys
+from ..formatter import TableFormatter
+
+_length = struct.Struct('<I').pack
+
+def _typecode(cls):
+    # None if cls isn't a type (e.g. the identity converter for untyped fields)
+    if not isinstance(cls, type):
+        return None
+    if issubclass(cls, int):
+        return 'q'
+    if issubclass(cls, float):
+        return 'd'
+    return 's'
+
+def _valuecode(value):
+    # Inferred numbers are widened to float64 so a column that starts
+    # with an int can still hold floats later on
+    return 'd' if isinstance(value, (int, float)) else 's'
+
+class BinaryTableFormatter(TableFormatter):
+    '''
+    Length-prefixed binary rows packed with struct (little endian).
+
+    The output starts with a header record:
+
+        b'STRB', uint16 field count, then per field a type code byte
+        (b'q' int64, b'd' float64, b's' string) and a uint16-length
+        prefixed UTF-8 name
+
+    followed by one record per row:
+
+        uint32 payload length, the int/float fields packed together in
+        column order, then each string field as a uint32-length prefixed
+        UTF-8 value
+
+    Field types are taken from types if it is set (a sequence of types,
+    one per column), otherwise from the record class's _types, which
+    print_table() passes in through field_types().  The type of any
+    other field is inferred from its value in the first row, with all
+    numbers stored as float64.  A table without rows still gets a
+    header, with string fields where no type is known.  The output is
+    bytes, so file must be opened in binary mode (sys.stdout.buffer is
+    the default).
+    '''
+    types = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._headers = None
+        self._codes = None
+        self._field_types = None
+
+    def field_types(self, types):
+        self._field_types = types
+
+    def headings(self, headers):
+        self._headers = list(headers)
+        self._codes = None
+
+    def row(self, rowdata):
+        self.rows([rowdata])
+
+    def rows(self, batch):
+        if self._codes is None:
+            self._layout(batch[0])
+        fixed = self._fixed.pack
+        numeric = self._numeric
+        strings = self._strings
+        length = _length
+        records = []
+        for rowdata in batch:
+            payload = fixed(*[ rowdata[n] for n in numeric ])
+            if strings:
+                text = [ str(rowdata[n]).encode('utf-8') for n in strings ]
+                payload += b''.join([ length(len(t)) + t for t in text ])
+            records.append(length(len(payload)) + payload)
+        self.write(b''.join(records), len(batch))
+
+    def flush(self):
+        if self._codes is None and self._headers is not None:
+            self._layout(None)
+        if self._buffer:
+            (self.file or sys.stdout.buffer).write(b''.join(self._buffer))
+            self._buffer.clear()
+        self._nlines = 0
+
+    def _layout(self, rowdata):
+        types = self.types if self.types is not None else self._field_types
+        codes = [ _typecode(t) for t in types ] if types else [ None ] * len(self._headers)
+        self._codes = [ code or ('s' if rowdata is None else _valuecode(rowdata[n]))
+                        for n, code in enumerate(codes) ]
+        self._numeric = [ n for n, code in enumerate(self._codes) if code != 's' ]
+        self._strings = [ n for n, code in enumerate(self._codes) if code == 's' ]
+        self._fixed = struct.Struct('<' + ''.join(self._codes[n] for n in self._numeric))
+        header = [ b'STRB', struct.pack('<H', len(self._headers)) ]
+        for name, code in zip(self._headers, self._codes):
+            name = name.encode('utf-8')
+            header.append(code.encode('ascii') + struct.pack('<H', len(name)) + name)
+        self.write(b''.join(header))
@@ -4,7 +4,10 @@ from ..formatter import TableFormatter
 
 class CSVTableFormatter(TableFormatter):
     def headings(self, headers):
-        print(','.join(headers))
+        self.write(','.join(headers) + '\n')
 
     def row(self, rowdata):
-        print(','.join(str(d) for d in rowdata))
+        self.write(','.join(str(d) for d in rowdata) + '\n')
+
+    def rows(self, batch):
+        self.write(''.join([ ','.join(map(str, rowdata)) + '\n' for rowdata in batch ]), len(batch))
@@ -4,13 +4,11 @@ from ..formatter import TableFormatter
 
 class HTMLTableFormatter(TableFormatter):
     def headings(self, headers):
-        print('<tr>', end=' ')
-        for h in headers:
-            print('<th>%s</th>' % h, end=' ')
-        print('</tr>')
+        self.write('<tr> ' + ''.join('<th>%s</th> ' % h for h in headers) + '</tr>\n')
 
     def row(self, rowdata):
-        print('<tr>', end=' ')
-        for d in rowdata:
-            print('<td>%s</td>' % d, end=' ')
-        print('</tr>')
+        self.write('<tr> ' + ''.join('<td>%s</td> ' % d for d in rowdata) + '</tr>\n')
+
+    def rows(self, batch):
+        line = '<tr> ' + '<td>%s</td> ' * len(batch[0]) + '</tr>\n'
+        self.write(''.join([ line % tuple(rowdata) for rowdata in batch ]), len(batch))
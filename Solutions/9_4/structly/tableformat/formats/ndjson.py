@@ -0,0 +1,23 @@
+# ndjson.py
+
+import json
+from ..formatter import TableFormatter
+
+class NDJSONTableFormatter(TableFormatter):
+    '''
+    Newline-delimited JSON, one object per row.  The keys are encoded once
+    in headings() and each row fills in a precompiled line template.
+    '''
+    _encode = json.JSONEncoder().encode
+
+    def headings(self, headers):
+        self._line = '{' + ', '.join('%s: %%s' % self._encode(h).replace('%', '%%')
+                                     for h in headers) + '}\n'
+
+    def row(self, rowdata):
+        self.write(self._line % tuple(map(self._encode, rowdata)))
+
+    def rows(self, batch):
+        line = self._line
+        encode = self._encode
+        self.write(''.join([ line % tuple(map(encode, rowdata)) for rowdata in batch ]), len(batch))
@@ -4,8 +4,13 @@ from ..formatter import TableFormatter
 
 class TextTableFormatter(TableFormatter):
     def headings(self, headers):
-        print(' '.join('%10s' % h for h in headers))
-        print(('-'*10 + ' ')*len(headers))
+        self.write(' '.join('%10s' % h for h in headers) + '\n')
+        self.write(('-'*10 + ' ')*len(headers) + '\n')
     
     def row(self, rowdata):
-        print(' '.join('%10s' % d for d in rowdata))
+        self.write(' '.join('%10s' % d for d in rowdata) + '\n')
+
+    def rows(self, batch):
+        # One format string for the whole batch
+        line = ' '.join(['%10s'] * len(batch[0])) + '\n'
+        self.write(''.join([ line % tuple(rowdata) for rowdata in batch ]), len(batch))
@@ -4,6 +4,8 @@ from ..formatter import TableFormatter
 
 class TSVTableFormatter(TableFormatter):
     def headings(self, headers):
-        print('\t'.join(headers))
+        self.write('\t'.join(headers) + '\n')
     def row(self, rowdata):
-        print('\t'.join(str(d) for d in rowdata))
+        self.write('\t'.join(str(d) for d in rowdata) + '\n')
+    def rows(self, batch):
+        self.write(''.join([ '\t'.join(map(str, rowdata)) + '\n' for rowdata in batch ]), len(batch))
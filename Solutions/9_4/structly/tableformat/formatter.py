@@ -1,18 +1,78 @@
 # formatter.py
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from itertools import chain, islice
+from operator import attrgetter
+import sys
 
-def print_table(records, fields, formatter):
+def print_table(records, fields, formatter, *, batch_size=1000):
+    '''
+    Print a table of records.  Rows are extracted with a single
+    attrgetter (or read column-wise if records has a column() method)
+    and handed to the formatter in batches of batch_size.  If the
+    records have _fields and _types (like a Structure), the types of
+    the printed fields are passed to the formatter's field_types().
+    '''
     if not isinstance(formatter, TableFormatter):
         raise RuntimeError('Expected a TableFormatter')
 
-    formatter.headings(fields)
-    for r in records:
-        rowdata = [getattr(r, fieldname) for fieldname in fields]
-        formatter.row(rowdata)
+    types = None
+    if hasattr(records, 'column'):
+        rows = zip(*(records.column(fieldname) for fieldname in fields))
+    else:
+        # Look at the first record for the _types of a Structure
+        records = iter(records)
+        first = next(records, None)
+        if first is not None:
+            records = chain([first], records)
+            types = _field_types(type(first), fields)
+        if len(fields) == 1:
+            rows = ((value,) for value in map(attrgetter(fields[0]), records))
+        else:
+            rows = map(attrgetter(*fields), records)
+
+    try:
+        formatter.field_types(types)
+        formatter.headings(fields)
+        while batch := list(islice(rows, batch_size)):
+            formatter.rows(batch)
+    finally:
+        formatter.flush()
+
+def _field_types(cls, fields):
+    names = getattr(cls, '_fields', None)
+    types = getattr(cls, '_types', None)
+    if names is None or types is None:
+        return None
+    lookup = dict(zip(names, types))
+    return [ lookup.get(name) for name in fields ]
 
 class TableFormatter(ABC):
+    '''
+    Base class for table formatters.  Output is collected in a buffer and
+    written to file (sys.stdout by default) in one write() call every
+    flush_size lines.  Call flush() when done (print_table() does this).
+    '''
     _formats = { }
 
+    def __init__(self, file=None, flush_size=1000):
+        self.file = file
+        self.flush_size = flush_size
+        self._buffer = []
+        self._nlines = 0
+
+    def write(self, text, nlines=1):
+        self._buffer.append(text)
+        self._nlines += nlines
+        if self._nlines >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            (self.file or sys.stdout).write(''.join(self._buffer))
+            self._buffer.clear()
+        self._nlines = 0
+
     @classmethod
     def __init_subclass__(cls):
         name = cls.__module__.split('.')[-1]
@@ -26,19 +86,63 @@ class TableFormatter(ABC):
     def row(self, rowdata):
         pass
 
+    def field_types(self, types):
+        '''
+        Receive the types of the fields (a list with None for unknown
+        ones) or None, before headings().  Ignored unless a formatter
+        needs it.
+        '''
+        pass
+
+    def rows(self, batch):
+        '''
+        Output a list of rows.  Formatters can override this to build
+        the text for a whole batch at once.
+        '''
+        for rowdata in batch:
+            self.row(rowdata)
+
 class ColumnFormatMixin:
     formats = []
     def row(self, rowdata):
         rowdata = [ (fmt % item) for fmt, item in zip(self.formats, rowdata)]
         super().row(rowdata)
 
+    def rows(self, batch):
+        batch = [ [ (fmt % item) for fmt, item in zip(self.formats, rowdata) ]
+                  for rowdata in batch ]
+        super().rows(batch)
+
 class UpperHeadersMixin:
     def headings(self, headers):
         super().headings([h.upper() for h in headers])
 
-def create_formatter(name, column_formats=None, upper_headers=False):
-    if name not in TableFormatter._formats:
+def load_format(name):
+    '''
+    Import the module for a format.  Formats outside of the formats
+    package can be provided by other distributions through entry points
+    in the 'structly.formats' group, each naming a TableFormatter class.
+    '''
+    try:
         __import__(f'{__package__}.formats.{name}')
+        return
+    except ModuleNotFoundError as e:
+        if e.name != f'{__package__}.formats.{name}':
+            raise
+
+    from importlib.metadata import entry_points
+    for ep in entry_points(group='structly.formats'):
+        if ep.name == name:
+            TableFormatter._formats[name] = ep.load()
+
+@lru_cache(maxsize=128)
+def formatter_class(name, column_formats=None, upper_headers=False):
+    '''
+    Return the formatter class for name with the requested mixins applied.
+    Composed classes are cached so they are only created once.
+    '''
+    if name not in TableFormatter._formats:
+        load_format(name)
         
     formatter_cls = TableFormatter._formats.get(name)
     if not formatter_cls:
@@ -46,13 +150,15 @@ def create_formatter(name, column_formats=None, upper_headers=False):
 
     if column_formats:
         class formatter_cls(ColumnFormatMixin, formatter_cls):
-              formats = column_formats
+              formats = list(column_formats)
 
     if upper_headers:
         class formatter_cls(UpperHeadersMixin, formatter_cls):
             pass
 
-    return formatter_cls()
-
-
+    return formatter_cls
 
+def create_formatter(name, column_formats=None, upper_headers=False, *, file=None, flush_size=1000):
+    column_formats = tuple(column_formats) if column_formats else None
+    formatter_cls = formatter_class(name, column_formats, bool(upper_headers))
+    return formatter_cls(file, flush_size)
@@ -1,6 +1,14 @@
 # validate.py
 
+from array import array
+
 class Validator:
+    # Source code of the test done by this class.  Each validator class
+    # gets a single check() method generated from the tests of all of the
+    # classes in its MRO (see compile_check()) instead of a chain of
+    # super().check() calls.
+    _check_code = ''
+
     def __init__(self, name=None):
         self.name = name
 
@@ -14,19 +22,100 @@ class Validator:
     def __set__(self, instance, value):
         instance.__dict__[self.name] = self.check(value)
 
+    @classmethod
+    def check_many(cls, values):
+        '''
+        Check a whole column of values and return a list of the indices
+        that fail.  If every class in the MRO has a bulk test for the
+        column (see _check_column()), no per-value calls are made.
+        Otherwise check() is called on each value.
+        '''
+        failed = set()
+        for klass in cls.__mro__:
+            if klass is Validator:
+                return sorted(failed)
+            if 'check' in vars(klass) and not hasattr(vars(klass)['check'].__func__, 'compiled'):
+                break
+            if '_check_code' in vars(klass):
+                column_test = vars(klass).get('_check_column')
+                bad = column_test.__func__(cls, values) if column_test else None
+                if bad is None:
+                    break
+                failed.update(bad)
+
+        check = cls.check
+        bad = []
+        for n, value in enumerate(values):
+            try:
+                check(value)
+            except (TypeError, ValueError):
+                bad.append(n)
+        return bad
+
     # Collect all derived classes into a dict
     validators = { }
     @classmethod
     def __init_subclass__(cls):
         cls.validators[cls.__name__] = cls
+        if 'check' not in vars(cls):
+            cls.compile_check()
+
+    @classmethod
+    def compile_check(cls):
+        '''
+        Create a check() method that runs the tests of every class in
+        the MRO in order.  A class that writes its own check() method
+        is called as-is.
+        '''
+        env = { }
+        code = 'def check(cls, value):\n'
+        for n, klass in enumerate(cls.__mro__):
+            if klass is Validator:
+                break
+            func = vars(klass).get('check')
+            if func is not None and not hasattr(func.__func__, 'compiled'):
+                env[f'_check{n}'] = func.__func__
+                code += f'    value = _check{n}(cls, value)\n'
+            elif '_check_code' in vars(klass):
+                code += ''.join(f'    {line}\n' for line in klass._check_code.splitlines())
+        code += '    return value\n'
+        exec(code, env)
+        env['check'].compiled = True
+        cls.check = classmethod(env['check'])
+
+def column_kind(values):
+    '''
+    Return 'i' or 'f' if values is an array.array or memoryview of
+    integers or floats.  Otherwise return None.  Other array types (such
+    as NumPy arrays) are left to the per-value checks, since their items
+    are not necessarily instances of int or float.
+    '''
+    if isinstance(values, array):
+        code = values.typecode
+    elif isinstance(values, memoryview):
+        code = values.format
+    else:
+        return None
+    if code in ('b', 'B', 'h', 'H', 'i', 'I', 'l', 'L', 'q', 'Q'):
+        return 'i'
+    elif code in ('f', 'd'):
+        return 'f'
+    return None
 
 class Typed(Validator):
     expected_type = object
+    _check_code = (
+        'if not isinstance(value, cls.expected_type):\n'
+        "    raise TypeError(f'expected {cls.expected_type}')"
+    )
+
     @classmethod
-    def check(cls, value):
-        if not isinstance(value, cls.expected_type):
-            raise TypeError(f'expected {cls.expected_type}')
-        return super().check(value)
+    def _check_column(cls, values):
+        # Typed buffers hold nothing but values of their own kind
+        kind = column_kind(values)
+        if (kind == 'i' and cls.expected_type is int) or (kind == 'f' and cls.expected_type is float):
+            return []
+        return None
 
 _typed_classes = [
     ('Integer', int),
@@ -37,18 +126,24 @@ globals().update((name, type(name, (Typed,), {'expected_type':ty}))
                  for name, ty in _typed_classes)
 
 class Positive(Validator):
+    _check_code = (
+        'if value < 0:\n'
+        "    raise ValueError('must be >= 0')"
+    )
+
     @classmethod
-    def check(cls, value):
-        if value < 0:
-            raise ValueError('must be >= 0')
-        return super().check(value)
+    def _check_column(cls, values):
+        if column_kind(values) is None:
+            return None
+        if len(values) == 0 or min(values) >= 0:
+            return []
+        return [ n for n, value in enumerate(values) if value < 0 ]
 
 class NonEmpty(Validator):
-    @classmethod
-    def check(cls, value):
-        if len(value) == 0:
-            raise ValueError('must be non-empty')
-        return super().check(value)
+    _check_code = (
+        'if len(value) == 0:\n'
+        "    raise ValueError('must be non-empty')"
+    )
 
 class PositiveInteger(Integer, Positive):
     pass
@@ -59,13 +154,49 @@ class PositiveFloat(Float, Positive):
 class NonEmptyString(String, NonEmpty):
     pass
 
-from inspect import signature
 from functools import wraps
 
 def isvalidator(item):
     return isinstance(item, type) and issubclass(item, Validator)
 
+def fast_wrapper(func, sig, annotations, retcheck, slow):
+    '''
+    Generate a wrapper that checks positional arguments directly by index.
+    Calls with keyword arguments or too few positional arguments, and any
+    call with a failing check, go through slow() which binds the signature
+    and reports every bad argument.
+    '''
+    positions = { param.name: n for n, param in enumerate(sig.parameters.values())
+                  if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD) }
+    if not all(name in positions for name in annotations):
+        return slow
+
+    env = { '_func': func, '_slow': slow, '_retcheck': retcheck }
+    nargs = max((positions[name] for name in annotations), default=-1) + 1
+    code = 'def wrapper(*args, **kwargs):\n'
+    code += f'    if kwargs or len(args) < {nargs}:\n'
+    code += '        return _slow(*args, **kwargs)\n'
+    code += '    try:\n'
+    for n, (name, validator) in enumerate(annotations.items()):
+        env[f'_check{n}'] = validator.check
+        code += f'        _check{n}(args[{positions[name]}])\n'
+    code += '        pass\n'
+    code += '    except Exception:\n'
+    code += '        pass\n'
+    code += '    else:\n'
+    code += '        result = _func(*args)\n'
+    if retcheck:
+        code += '        try:\n'
+        code += '            _retcheck.check(result)\n'
+        code += '        except Exception as e:\n'
+        code += "            raise TypeError(f'Bad return: {e}') from None\n"
+    code += '        return result\n'
+    code += '    return _slow(*args, **kwargs)\n'
+    exec(code, env)
+    return env['wrapper']
+
 def validated(func):
+    from inspect import signature
     sig = signature(func)
 
     # Gather the function annotations
@@ -75,7 +206,6 @@ def validated(func):
     # Get the return annotation (if any)
     retcheck = annotations.pop('return', None)
 
-    @wraps(func)
     def wrapper(*args, **kwargs):
         bound = sig.bind(*args, **kwargs)
         errors = []
@@ -100,15 +230,15 @@ def validated(func):
                 raise TypeError(f'Bad return: {e}') from None
         return result
 
-    return wrapper
+    return wraps(func)(fast_wrapper(func, sig, annotations, retcheck, wrapper))
 
 def enforce(**annotations):
     retcheck = annotations.pop('return_', None)
 
     def decorate(func):
+        from inspect import signature
         sig = signature(func)
 
-        @wraps(func)
         def wrapper(*args, **kwargs):
             bound = sig.bind(*args, **kwargs)
             errors = []
@@ -131,7 +261,7 @@ def enforce(**annotations):
                 except Exception as e:
                     raise TypeError(f'Bad return: {e}') from None
             return result
-        return wrapper
+        return wraps(func)(fast_wrapper(func, sig, annotations, retcheck, wrapper))
     return decorate
 
 # Examples
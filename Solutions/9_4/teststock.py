@@ -0,0 +1,277 @@
+# teststock.py
+
+import stock
+import unittest
+from structly import reader, Structure
+from structly.validate import PositiveInteger, PositiveFloat, NonEmptyString
+
+class TestStock(unittest.TestCase):
+    def test_create(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        self.assertEqual(s.name, 'GOOG')
+        self.assertEqual(s.shares, 100)
+        self.assertEqual(s.price, 490.1)
+
+    def test_create_keyword(self):
+        s = stock.Stock(name='GOOG', shares=100, price=490.1)
+        self.assertEqual(s.name, 'GOOG')
+        self.assertEqual(s.shares, 100)
+        self.assertEqual(s.price, 490.1)
+        
+    def test_cost(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        self.assertEqual(s.cost, 49010.0)
+
+    def test_sell(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        s.sell(25)
+        self.assertEqual(s.shares, 75)
+
+    def test_sell_keyword(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        s.sell(nshares=25)
+        self.assertEqual(s.shares, 75)
+
+    def test_sell_badvalue(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(TypeError):
+            s.sell(-25)
+        with self.assertRaises(TypeError):
+            s.sell(nshares='25')
+
+    def test_from_row(self):
+        s = stock.Stock.from_row(['GOOG','100','490.1'])
+        self.assertEqual(s.name, 'GOOG')
+        self.assertEqual(s.shares, 100)
+        self.assertEqual(s.price, 490.1)
+
+    def test_from_row_badvalue(self):
+        with self.assertRaises(ValueError):
+            stock.Stock.from_row(['GOOG','-100','490.1'])
+        with self.assertRaises(ValueError):
+            stock.Stock.from_row(['GOOG','x','490.1'])
+
+    def test_from_rows(self):
+        rows = [['GOOG','100','490.1'], ['IBM','-50','91.1']]
+        with self.assertRaises(ValueError):
+            stock.Stock.from_rows(rows)
+        port = stock.Stock.from_rows(rows, validate=False)
+        self.assertEqual(port[1].shares, -50)
+        self.assertEqual(port[0], stock.Stock('GOOG', 100, 490.1))
+
+    def test_custom_from_row(self):
+        class Holding(Structure):
+            name = String()
+            shares = PositiveInteger()
+
+            @classmethod
+            def from_row(cls, row):
+                return cls(row[1], int(row[0]))
+
+        self.assertEqual(Holding.from_row(['100', 'GOOG']), Holding('GOOG', 100))
+        self.assertEqual(Holding.from_rows([['100', 'GOOG']], validate=False),
+                         [Holding('GOOG', 100)])
+
+    def test_repr(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        self.assertEqual(repr(s), "Stock('GOOG', 100, 490.1)")
+
+    def test_eq(self):
+        a = stock.Stock('GOOG', 100, 490.1)
+        b = stock.Stock('GOOG', 100, 490.1)
+        self.assertTrue(a==b)
+
+    # Tests for failure conditions
+    def test_shares_badtype(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(TypeError):
+            s.shares = '50'
+
+    def test_shares_badvalue(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(ValueError):
+            s.shares = -50
+
+    def test_price_badtype(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(TypeError):
+            s.price = '45.23'
+
+    def test_price_badvalue(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(ValueError):
+            s.price = -45.23
+
+    def test_bad_attribute(self):
+        s = stock.Stock('GOOG', 100, 490.1)
+        with self.assertRaises(AttributeError):
+            s.share = 100
+
+class SlottedStock(Structure, slots=True):
+    name = String()
+    shares = PositiveInteger()
+    price = PositiveFloat()
+
+class TestSlots(unittest.TestCase):
+    def test_create(self):
+        s = SlottedStock('GOOG', 100, 490.1)
+        self.assertEqual(SlottedStock._fields, ('name', 'shares', 'price'))
+        self.assertEqual(tuple(s), ('GOOG', 100, 490.1))
+        self.assertFalse(hasattr(s, '__dict__'))
+
+    def test_from_row(self):
+        s = SlottedStock.from_row(['GOOG','100','490.1'])
+        self.assertEqual(s, SlottedStock('GOOG', 100, 490.1))
+
+    def test_from_rows(self):
+        port = SlottedStock.from_rows([['GOOG','100','490.1']], validate=False)
+        self.assertEqual(port, [SlottedStock('GOOG', 100, 490.1)])
+
+    def test_checks(self):
+        s = SlottedStock('GOOG', 100, 490.1)
+        with self.assertRaises(TypeError):
+            s.shares = '50'
+        with self.assertRaises(ValueError):
+            s.shares = -50
+        with self.assertRaises(AttributeError):
+            s.share = 100
+
+class TestCheckMany(unittest.TestCase):
+    def test_array(self):
+        from array import array
+        values = array('q', [1, 2, -3, 4, -5])
+        self.assertEqual(PositiveInteger.check_many(values), [2, 4])
+        self.assertEqual(PositiveFloat.check_many(values), [0, 1, 2, 3, 4])
+
+    def test_list(self):
+        self.assertEqual(PositiveInteger.check_many([1, -2, 'a', 3.0]), [1, 2, 3])
+        self.assertEqual(NonEmptyString.check_many(['a', '', 3]), [1, 2])
+
+class TestFormatter(unittest.TestCase):
+    def test_buffered_file(self):
+        import io
+        from structly import create_formatter, print_table
+        out = io.StringIO()
+        formatter = create_formatter('csv', file=out, flush_size=2)
+        port = [stock.Stock('GOOG', 100, 490.1), stock.Stock('IBM', 50, 91.1)]
+        print_table(port, ['name', 'shares'], formatter)
+        self.assertEqual(out.getvalue(), 'name,shares\nGOOG,100\nIBM,50\n')
+
+    def test_reuse(self):
+        import io
+        from structly import create_formatter, print_table
+        out = io.StringIO()
+        formatter = create_formatter('csv', ['%s', '%d'], upper_headers=True, file=out)
+        self.assertIs(type(formatter), type(create_formatter('csv', ['%s', '%d'], upper_headers=True)))
+        port = [stock.Stock('GOOG', 100, 490.1)]
+        print_table(port, ['name', 'shares'], formatter)
+        print_table(port, ['name', 'shares'], formatter)
+        self.assertEqual(out.getvalue(), 'NAME,SHARES\nGOOG,100\n' * 2)
+
+    def test_autotext(self):
+        import io
+        from structly import create_formatter, print_table
+        out = io.StringIO()
+        port = [stock.Stock('GOOG', 100, 490.1), stock.Stock('BRK.A', 5, 1.5)]
+        print_table(port, ['name', 'shares'], create_formatter('autotext', file=out))
+        self.assertEqual(out.getvalue(),
+                         ' name shares\n----- ------\n GOOG    100\nBRK.A      5\n')
+        out = io.StringIO()
+        print_table(port, ['name', 'shares'], create_formatter('autotext', file=out), batch_size=1)
+        self.assertEqual(out.getvalue(),
+                         ' name shares\n----- ------\n GOOG    100\nBRK.A      5\n')
+
+    def test_ndjson(self):
+        import io, json
+        from structly import create_formatter, print_table
+        out = io.StringIO()
+        port = [stock.Stock('GOOG', 100, 490.1)]
+        print_table(port, ['name', 'shares', 'price'], create_formatter('ndjson', file=out))
+        self.assertEqual(json.loads(out.getvalue()), {'name': 'GOOG', 'shares': 100, 'price': 490.1})
+
+    def test_binary(self):
+        import io, struct
+        from structly import create_formatter, print_table
+        out = io.BytesIO()
+        port = [stock.Stock('GOOG', 100, 490.1)]
+        print_table(port, ['name', 'shares', 'price'], create_formatter('binary', file=out))
+        data = out.getvalue()
+        header = b'STRB\x03\x00s\x04\x00nameq\x06\x00sharesd\x05\x00price'
+        self.assertTrue(data.startswith(header))
+        size, shares, price, namelen = struct.unpack_from('<IqdI', data, len(header))
+        self.assertEqual((size, shares, price, namelen), (24, 100, 490.1, 4))
+        self.assertEqual(data[len(header)+24:], b'GOOG')
+
+    def test_binary_types(self):
+        import io, struct
+        from structly import create_formatter, print_table
+        class Row:
+            def __init__(self, name, value):
+                self.name = name
+                self.value = value
+        out = io.BytesIO()
+        print_table([Row('x', 100), Row('y', 2.5)], ['name', 'value'],
+                    create_formatter('binary', file=out))
+        self.assertTrue(out.getvalue().startswith(b'STRB\x02\x00s\x04\x00named\x05\x00value'))
+        out = io.BytesIO()
+        print_table([stock.Stock('GOOG', 100, 490.1)], ['shares'], create_formatter('binary', file=out))
+        self.assertEqual(out.getvalue(), b'STRB\x01\x00q\x06\x00shares' + struct.pack('<Iq', 8, 100))
+
+    def test_binary_empty(self):
+        import io
+        from structly import create_formatter, print_table
+        out = io.BytesIO()
+        formatter = create_formatter('binary', file=out)
+        formatter.types = stock.Stock._types
+        print_table([], ['name', 'shares', 'price'], formatter)
+        self.assertEqual(out.getvalue(), b'STRB\x03\x00s\x04\x00nameq\x06\x00sharesd\x05\x00price')
+
+class TestReader(unittest.TestCase):
+    lines = ['name,shares,price', 'AA,100,32.20', 'IBM,x,91.10', 'CAT,150,83.44']
+
+    def test_read_instances(self):
+        port = reader.read_csv_as_instances('../../Data/portfolio.csv', stock.Stock)
+        self.assertEqual(len(port), 7)
+        self.assertEqual(port[0], stock.Stock('AA', 100, 32.2))
+
+    def test_iter_instances(self):
+        records = reader.iter_csv_as_instances(self.lines, stock.Stock)
+        self.assertEqual(next(records), stock.Stock('AA', 100, 32.2))
+        with self.assertLogs('structly.reader', 'WARNING'):
+            self.assertEqual(next(records), stock.Stock('CAT', 150, 83.44))
+
+    def test_parallel(self):
+        serial = reader.read_csv_as_instances('../../Data/missing.csv', stock.Stock)
+        with self.assertLogs('structly.reader', 'WARNING') as logs:
+            port = reader.read_csv_as_instances('../../Data/missing.csv', stock.Stock, parallel=3)
+        self.assertEqual(port, serial)
+        self.assertIn('Row 4: Bad row', logs.output[0])
+
+    def test_columns_where(self):
+        records = reader.read_csv_as_dicts('../../Data/portfolio.csv', [float, str],
+                                           columns=['price', 'name'],
+                                           where={'name': lambda name: name == 'IBM'})
+        self.assertEqual(records, [{'price': 91.1, 'name': 'IBM'},
+                                   {'price': 70.44, 'name': 'IBM'}])
+
+    def test_where_skips_conversion(self):
+        with self.assertNoLogs('structly.reader'):
+            port = reader.csv_as_instances(self.lines, stock.Stock,
+                                           where={'shares': str.isdigit})
+        self.assertEqual(len(port), 2)
+
+    def test_short_rows(self):
+        lines = ['name,shares,price', 'AA,100,1.0', '', 'BB,2,3.0', 'CC']
+        with self.assertLogs('structly.reader', 'WARNING') as logs:
+            records = reader.csv_as_dicts(lines, [str, float], columns=['name', 'price'])
+        self.assertEqual(records, [{'name': 'AA', 'price': 1.0}, {'name': 'BB', 'price': 3.0}])
+        self.assertIn('Row 2: Bad row', logs.output[0])
+        self.assertIn('Row 4: Bad row', logs.output[1])
+
+    def test_iter_read_dicts(self):
+        records = reader.iter_read_csv_as_dicts('../../Data/portfolio.csv', [str, int, float])
+        self.assertEqual(next(records), {'name': 'AA', 'shares': 100, 'price': 32.2})
+        self.assertEqual(sum(1 for _ in records), 6)
+
+if __name__ == '__main__':
+    unittest.main()